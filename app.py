@@ -8,12 +8,21 @@ Trello card due date changes and reminders.
 
 import os
 import sqlite3
-import json
+import hashlib
 import logging
+import functools
+import threading
+import time
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask import Flask, render_template, jsonify, request, redirect, url_for, g, has_app_context, stream_with_context
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from flask_compress import Compress
 from dotenv import load_dotenv
+import orjson
 import requests
+import schema
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Set up logging
 logging.basicConfig(
@@ -33,15 +42,86 @@ load_dotenv()
 TRELLO_API_KEY = os.getenv("TRELLO_API_KEY")
 TRELLO_TOKEN = os.getenv("TRELLO_TOKEN")
 TRELLO_BOARD_ID = os.getenv("TRELLO_BOARD_ID")
+CARD_SYNC_INTERVAL_SECONDS = float(os.getenv("CARD_SYNC_INTERVAL_SECONDS", "120"))
 DATABASE = 'cards_due.db'
 TRELLO_CARDS_DB = 'trello_cards.db'
 
+# Shared HTTP session so Trello syncs reuse pooled keep-alive connections
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Settings applied to every new SQLite connection (journal_mode=WAL is persistent
+# and set once by init_db/init_trello_cards_db)
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+)
+
+# Cached reminder totals keyed by is_read filter (None = all reminders)
+COUNT_CACHE_TTL = 30
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+
+# Cached /api/dashboard-data payload as (serialized body, ETag)
+DASHBOARD_CACHE_TTL = 60
+_dashboard_cache = {'ts': 0, 'payload': None}
+
+# Seconds a card's details are served from memory; each gunicorn worker keeps
+# its own copy, and only one process runs the Trello sync
+CARD_DETAILS_CACHE_TTL = 60
+
+# Number of cards serialized per chunk of the streamed /api/cards response
+CARDS_STREAM_BATCH_SIZE = 200
+
+# Per-thread SQLite connections for code running outside a request (background sync, startup)
+_thread_local = threading.local()
+
+# meta row holding the time of the last completed Trello sync. It lives in the
+# database because the sync may run in another process (gunicorn, run.py)
+LAST_SYNC_META_KEY = 'last_card_sync'
+
+# ETag of the last board cards response that was written to the database
+_cards_etag = None
+
 # Check and log credentials
 logger.debug(f"API Key: {TRELLO_API_KEY[:4]}..." if TRELLO_API_KEY else "API Key not found")
 logger.debug(f"Token: {TRELLO_TOKEN[:4]}..." if TRELLO_TOKEN else "Token not found")
 logger.debug(f"Board ID: {TRELLO_BOARD_ID}" if TRELLO_BOARD_ID else "Board ID not found")
 
+class ORJSONProvider(JSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib json module."""
+    
+    option = orjson.OPT_NAIVE_UTC
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Build the body straight from orjson's bytes, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option)
+        return self._app.response_class(body, mimetype='application/json')
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Compress JSON API responses; small payloads aren't worth the CPU
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
+# Flask-Compress would buffer a streamed response in full before gzipping it,
+# so /api/cards (the only streamed route) is sent uncompressed instead
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
 
 # Add utility functions to Jinja environment
 @app.context_processor
@@ -50,95 +130,94 @@ def utility_processor():
         return datetime.now()
     return dict(now=now)
 
-def get_db_connection(db_name=DATABASE):
-    """Create a database connection and return connection and cursor."""
+def _connect(db_name):
+    """Open a new SQLite connection and apply the per-connection settings."""
     conn = sqlite3.connect(db_name)
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+def get_db_connection(db_name=DATABASE):
+    """
+    Return a shared database connection.
+    Inside a request the connection is kept on flask.g and closed on teardown;
+    other threads reuse one connection per database for their lifetime.
+    """
+    if has_app_context():
+        connections = g.setdefault('db_connections', {})
+    else:
+        connections = getattr(_thread_local, 'connections', None)
+        if connections is None:
+            connections = _thread_local.connections = {}
+    
+    conn = connections.get(db_name)
+    if conn is None:
+        conn = connections[db_name] = _connect(db_name)
+    return conn
+
+def close_thread_connections():
+    """Close the connections held by the current thread outside of a request."""
+    for conn in getattr(_thread_local, 'connections', {}).values():
+        conn.close()
+    _thread_local.connections = {}
+
+def rows_to_dicts(cursor):
+    """Fetch the remaining rows of an executed cursor as dicts keyed by column name."""
+    # Plain tuples are cheaper to build than sqlite3.Row objects we'd only convert anyway
+    cursor.row_factory = None
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def compute_etag(data):
+    """Return a short content hash of `data` (bytes) for use as an ETag."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def client_has_etag(etag):
+    """Check whether the request's If-None-Match already names `etag`."""
+    # Flask-Compress suffixes the ETag of compressed responses (e.g. "<etag>:gzip")
+    return any(tag.split(':', 1)[0] == etag
+               for tag in request.if_none_match.as_set(include_weak=True))
+
+def with_etag(response, etag):
+    """Attach `etag` and make clients revalidate before reusing their copy."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def not_modified(etag):
+    """Build an empty 304 response for `etag`."""
+    return with_etag(app.response_class(status=304), etag)
+
+@app.teardown_appcontext
+def close_db_connections(exception):
+    """Close the connections opened during this request."""
+    for conn in g.pop('db_connections', {}).values():
+        conn.close()
+
 def init_db():
-    """Initialize the SQLite database and create tables if they don't exist."""
+    """Initialize the SQLite database and bring its schema up to date."""
     conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Table for storing due date history
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS card_due (
-            card_id TEXT PRIMARY KEY,
-            name TEXT,
-            due_date TEXT,
-            due_date_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
     
-    # Table for storing reminders history
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS reminders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            card_id TEXT,
-            card_name TEXT,
-            old_due TEXT,
-            new_due TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_read INTEGER DEFAULT 0
-        )
-    ''')
-    
-    # Table for tracking card comments
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS card_comments (
-            comment_id TEXT PRIMARY KEY,
-            card_id TEXT,
-            comment_text TEXT,
-            created_at TIMESTAMP,
-            suppressed_notification INTEGER DEFAULT 0
-        )
-    ''')
-    
-    # Check if name column exists in card_due table, add it if it doesn't
-    try:
-        cursor.execute("SELECT name FROM card_due LIMIT 1")
-    except sqlite3.OperationalError:
-        # Column doesn't exist, add it
-        logger.info("Adding 'name' column to card_due table")
-        cursor.execute("ALTER TABLE card_due ADD COLUMN name TEXT")
-    
-    # Check if suppressed_notification column exists in card_comments table, add it if it doesn't
-    try:
-        cursor.execute("SELECT suppressed_notification FROM card_comments LIMIT 1")
-    except sqlite3.OperationalError:
-        # Column doesn't exist, add it
-        logger.info("Adding 'suppressed_notification' column to card_comments table")
-        cursor.execute("ALTER TABLE card_comments ADD COLUMN suppressed_notification INTEGER DEFAULT 0")
-    
-    conn.commit()
-    conn.close()
+    # WAL lets readers and the writer work concurrently and groups fsyncs at checkpoints
+    conn.execute('PRAGMA journal_mode=WAL')
+    schema.migrate(conn, schema.CARDS_DUE_MIGRATIONS)
     
     logger.info("Database initialized successfully")
 
 def init_trello_cards_db():
     """Initialize the Trello cards database."""
     conn = get_db_connection(TRELLO_CARDS_DB)
-    cursor = conn.cursor()
-    
-    # Table for storing card details
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS cards (
-            card_id TEXT PRIMARY KEY,
-            name TEXT,
-            description TEXT,
-            url TEXT,
-            list_name TEXT,
-            due_date TEXT,
-            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
     
-    conn.commit()
-    conn.close()
+    conn.execute('PRAGMA journal_mode=WAL')
+    schema.migrate(conn, schema.TRELLO_CARDS_MIGRATIONS)
 
-def get_all_cards_from_trello():
-    """Fetch all cards on the Trello board from the Trello API."""
+def get_all_cards_from_trello(etag=None):
+    """
+    Fetch all cards on the Trello board from the Trello API.
+    Sends `etag` as If-None-Match and returns (cards, etag); cards is None when
+    the board is unchanged (304) and an empty list on errors.
+    """
     url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/cards"
     params = {
         "key": TRELLO_API_KEY,
@@ -146,88 +225,142 @@ def get_all_cards_from_trello():
         "fields": "id,due,name,desc,url",
         "list": "true"
     }
+    headers = {"If-None-Match": etag} if etag else {}
     
     if not TRELLO_API_KEY or not TRELLO_TOKEN:
         logger.error("Missing Trello API credentials. Check your .env file.")
-        return []
+        return [], None
     
     try:
         logger.debug(f"Fetching cards from board {TRELLO_BOARD_ID}")
-        response = requests.get(url, params=params)
+        response = _session.get(url, params=params, headers=headers, timeout=(3.05, 10))
+        if response.status_code == 304:
+            logger.debug("Cards unchanged since last sync")
+            return None, etag
         response.raise_for_status()  # This will raise an exception for HTTP errors
-        cards = response.json()
+        # orjson parses straight from the response bytes, much faster than response.json()
+        cards = orjson.loads(response.content)
         logger.info(f"Successfully fetched {len(cards)} cards from Trello")
-        return cards
+        return cards, response.headers.get("ETag")
     except requests.exceptions.HTTPError as he:
         logger.error(f"HTTP Error fetching cards: {he}")
         logger.error(f"Response: {he.response.text}")
-        return []
+        return [], None
     except Exception as e:
         logger.error(f"Exception fetching cards: {str(e)}")
-        return []
+        return [], None
 
 def update_cards_database():
     """Update the cards database with the latest information from Trello."""
-    cards = get_all_cards_from_trello()
+    global _cards_etag
+    
+    cards, etag = get_all_cards_from_trello(_cards_etag)
+    if cards is None:
+        # Nothing changed on the board since the last sync
+        record_last_sync()
+        return
     if not cards:
         return
     
-    # Initialize databases if they don't exist
-    init_db()
-    init_trello_cards_db()
+    rows = [
+        (
+            card.get("id"),
+            card.get("name"),
+            card.get("desc", ""),
+            card.get("url"),
+            card.get("list", {}).get("name", "Unknown List"),
+            card.get("due")
+        )
+        for card in cards
+    ]
     
     conn = get_db_connection(TRELLO_CARDS_DB)
+    # Attach the reminders database so card_due names are refreshed in the same transaction
+    conn.execute('ATTACH DATABASE ? AS due_db', (DATABASE,))
     cursor = conn.cursor()
     
-    for card in cards:
-        card_id = card.get("id")
-        name = card.get("name")
-        description = card.get("desc", "")
-        url = card.get("url")
-        due_date = card.get("due")
-        list_name = card.get("list", {}).get("name", "Unknown List")
-        
-        cursor.execute('''
-            INSERT INTO cards (card_id, name, description, url, list_name, due_date)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(card_id) DO UPDATE SET
-                name = excluded.name,
-                description = excluded.description,
-                url = excluded.url,
-                list_name = excluded.list_name,
-                due_date = excluded.due_date,
-                last_updated = CURRENT_TIMESTAMP
-        ''', (card_id, name, description, url, list_name, due_date))
-        
-        # Also update the name in card_due table if it exists
-        try:
-            conn_due = get_db_connection()
-            cursor_due = conn_due.cursor()
-            cursor_due.execute('''
-                UPDATE card_due 
-                SET name = ? 
-                WHERE card_id = ?
-            ''', (name, card_id))
-            conn_due.commit()
-            conn_due.close()
-        except Exception as e:
-            logger.error(f"Error updating name in card_due: {str(e)}")
-    
-    conn.commit()
-    conn.close()
+    try:
+        # The connection is reused, so roll back on failure rather than leave a transaction open
+        with conn:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.executemany('''
+                INSERT INTO cards (card_id, name, description, url, list_name, due_date)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(card_id) DO UPDATE SET
+                    name = excluded.name,
+                    description = excluded.description,
+                    url = excluded.url,
+                    list_name = excluded.list_name,
+                    due_date = excluded.due_date,
+                    last_updated = CURRENT_TIMESTAMP
+            ''', rows)
+            
+            # Also update the name in the card_due table where it changed
+            cursor.execute('''
+                UPDATE due_db.card_due
+                SET name = cards.name
+                FROM main.cards AS cards
+                WHERE cards.card_id = card_due.card_id
+                  AND card_due.name IS NOT cards.name
+            ''')
+    finally:
+        cursor.close()
+        conn.execute('DETACH DATABASE due_db')
+    
+    invalidate_dashboard_cache()
+    _load_card_details.cache_clear()
+    
+    # Only remember the ETag once the cards it describes are stored
+    _cards_etag = etag
+    record_last_sync()
     
     logger.info(f"Updated {len(cards)} cards in database")
 
+def record_last_sync():
+    """Store the current time as the last completed Trello sync."""
+    conn = get_db_connection()
+    with conn:
+        conn.execute('''
+            INSERT INTO meta (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        ''', (LAST_SYNC_META_KEY, datetime.now().isoformat(timespec='seconds')))
+
+def get_last_sync():
+    """Return the time of the last completed Trello sync by any process, or None."""
+    conn = get_db_connection()
+    row = conn.execute('SELECT value FROM meta WHERE key = ?', (LAST_SYNC_META_KEY,)).fetchone()
+    return datetime.fromisoformat(row[0]) if row else None
+
+def run_card_sync(interval=CARD_SYNC_INTERVAL_SECONDS):
+    """Run update_cards_database() every `interval` seconds, forever."""
+    while True:
+        try:
+            update_cards_database()
+        except Exception as e:
+            logger.error(f"Error in background card sync: {str(e)}")
+        time.sleep(interval)
+
+def start_card_sync_scheduler(interval=CARD_SYNC_INTERVAL_SECONDS):
+    """Run run_card_sync() in a daemon thread."""
+    thread = threading.Thread(target=run_card_sync, args=(interval,), name='card-sync', daemon=True)
+    thread.start()
+    logger.info(f"Background card sync started (every {interval} seconds)")
+    return thread
+
 def get_card_details(card_id):
-    """Get details for a specific card."""
+    """Get details for a specific card (cached for up to CARD_DETAILS_CACHE_TTL seconds)."""
+    # The time bucket is part of the cache key, so entries expire without a sync in this process
+    return _load_card_details(card_id, int(time.monotonic() // CARD_DETAILS_CACHE_TTL))
+
+@functools.lru_cache(maxsize=1024)
+def _load_card_details(card_id, ttl_bucket):
+    """Read a card's details from the database; see get_card_details."""
     conn = get_db_connection(TRELLO_CARDS_DB)
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM cards WHERE card_id = ?', (card_id,))
     card = cursor.fetchone()
     
-    conn.close()
-    
     if card:
         return dict(card)
     return None
@@ -243,35 +376,66 @@ def get_card_comments(card_id):
         ORDER BY created_at DESC
     ''', (card_id,))
     
-    comments = cursor.fetchall()
-    conn.close()
-    
-    return [dict(comment) for comment in comments]
-
-def get_reminders(limit=50, offset=0, is_read=None):
-    """Get reminders with pagination and filtering."""
+    return rows_to_dicts(cursor)
+
+def encode_reminder_cursor(reminder):
+    """Build the pagination cursor pointing just past the given reminder."""
+    return f"{reminder['created_at']}|{reminder['id']}"
+
+def decode_reminder_cursor(cursor_value):
+    """Parse a pagination cursor into (created_at, id), or None if it is invalid."""
+    if not cursor_value:
+        return None
+    created_at, _, reminder_id = cursor_value.rpartition('|')
+    if not created_at or not reminder_id.isdigit():
+        return None
+    return created_at, int(reminder_id)
+
+def get_reminders(limit=50, before=None, is_read=None):
+    """
+    Get a page of reminders, newest first, using keyset pagination.
+    `before` is a (created_at, id) pair from decode_reminder_cursor().
+    Returns the reminders and the cursor for the next page (None on the last page).
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     query = 'SELECT * FROM reminders'
+    conditions = []
     params = []
     
     if is_read is not None:
-        query += ' WHERE is_read = ?'
+        conditions.append('is_read = ?')
         params.append(is_read)
     
-    query += ' ORDER BY created_at DESC LIMIT ? OFFSET ?'
-    params.extend([limit, offset])
+    if before is not None:
+        conditions.append('(created_at, id) < (?, ?)')
+        params.extend(before)
+    
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    
+    # Fetch one extra row to find out whether there is a next page
+    query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    params.append(limit + 1)
     
     cursor.execute(query, params)
-    reminders = cursor.fetchall()
+    reminders = rows_to_dicts(cursor)
     
-    conn.close()
+    next_cursor = None
+    if len(reminders) > limit:
+        reminders = reminders[:limit]
+        next_cursor = encode_reminder_cursor(reminders[-1])
     
-    return [dict(reminder) for reminder in reminders]
+    return reminders, next_cursor
 
 def count_reminders(is_read=None):
-    """Count total reminders for pagination."""
+    """Count total reminders for pagination, using a short-lived cache."""
+    with _count_cache_lock:
+        cached = _count_cache.get(is_read)
+        if cached and time.monotonic() - cached[0] < COUNT_CACHE_TTL:
+            return cached[1]
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -285,10 +449,23 @@ def count_reminders(is_read=None):
     cursor.execute(query, params)
     count = cursor.fetchone()[0]
     
-    conn.close()
+    with _count_cache_lock:
+        _count_cache[is_read] = (time.monotonic(), count)
     
     return count
 
+def _adjust_cached_counts(deltas):
+    """Apply in-place adjustments to cached reminder totals."""
+    with _count_cache_lock:
+        for key, delta in deltas.items():
+            if key in _count_cache:
+                ts, value = _count_cache[key]
+                _count_cache[key] = (ts, value + delta)
+
+def invalidate_dashboard_cache():
+    """Drop the cached dashboard payload so the next request rebuilds it."""
+    _dashboard_cache['payload'] = None
+
 def add_reminder(card_id, card_name, old_due, new_due):
     """Add a new reminder to the database."""
     conn = get_db_connection()
@@ -300,103 +477,47 @@ def add_reminder(card_id, card_name, old_due, new_due):
     ''', (card_id, card_name, old_due, new_due))
     
     conn.commit()
-    conn.close()
+    
+    _adjust_cached_counts({None: 1, 0: 1})
+    invalidate_dashboard_cache()
 
 def mark_reminder_as_read(reminder_id):
     """Mark a reminder as read."""
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute('UPDATE reminders SET is_read = 1 WHERE id = ?', (reminder_id,))
+    cursor.execute('UPDATE reminders SET is_read = 1 WHERE id = ? AND is_read = 0', (reminder_id,))
+    updated = cursor.rowcount
     
     conn.commit()
-    conn.close()
+    
+    if updated:
+        _adjust_cached_counts({0: -1, 1: 1})
+        invalidate_dashboard_cache()
 
 def get_card_notification_status(card_id):
     """Check if notifications for a card are muted due to comments."""
-    # Get the last due date change
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Get the due date updated timestamp
-    cursor.execute('SELECT due_date_updated_at FROM card_due WHERE card_id = ?', (card_id,))
-    due_date_row = cursor.fetchone()
-    
-    if not due_date_row or not due_date_row[0]:
-        conn.close()
-        return {
-            "notifications_muted": False,
-            "reason": None
-        }
-    
-    due_date_updated_at = due_date_row[0]
-    
-    # Get the most recent comment
+    # Get the due date change time and the most recent comment time (both epoch seconds)
     cursor.execute('''
-        SELECT created_at FROM card_comments 
-        WHERE card_id = ? 
-        ORDER BY created_at DESC 
-        LIMIT 1
+        SELECT cd.due_date_updated_epoch,
+               (SELECT MAX(created_epoch) FROM card_comments WHERE card_id = cd.card_id)
+        FROM card_due cd
+        WHERE cd.card_id = ?
     ''', (card_id,))
+    row = cursor.fetchone()
+    due_date_epoch, comment_epoch = row if row else (None, None)
     
-    comment_row = cursor.fetchone()
-    conn.close()
-    
-    if not comment_row or not comment_row[0]:
+    # Check if the comment was posted after the due date change
+    if due_date_epoch is not None and comment_epoch is not None and comment_epoch > due_date_epoch:
+        logger.info(f"Notifications muted for card {card_id}: Comment found after due date change")
         return {
-            "notifications_muted": False,
-            "reason": None
+            "notifications_muted": True,
+            "reason": "Comment added after due date change"
         }
     
-    comment_timestamp = comment_row[0]
-    
-    # Log the raw timestamps for debugging
-    logger.debug(f"Card ID: {card_id}")
-    logger.debug(f"Due date changed at: {due_date_updated_at} (type: {type(due_date_updated_at)})")
-    logger.debug(f"Latest comment at: {comment_timestamp} (type: {type(comment_timestamp)})")
-    
-    # Convert both timestamps to datetime objects for comparison
-    try:
-        # Handle potential timezone issues by ensuring both are in the same format
-        # For due_date_updated_at from SQLite
-        if isinstance(due_date_updated_at, str) and 'Z' in due_date_updated_at:
-            due_date_dt = datetime.fromisoformat(due_date_updated_at.replace('Z', '+00:00'))
-        else:
-            # If it's a naive datetime string from SQLite (no Z or timezone info)
-            due_date_dt = datetime.fromisoformat(due_date_updated_at if isinstance(due_date_updated_at, str) else str(due_date_updated_at))
-            # Make it naive to ensure consistent comparison
-            due_date_dt = due_date_dt.replace(tzinfo=None)
-        
-        # For comment_timestamp from database
-        if isinstance(comment_timestamp, str) and 'Z' in comment_timestamp:
-            comment_dt = datetime.fromisoformat(comment_timestamp.replace('Z', '+00:00'))
-        else:
-            comment_dt = datetime.fromisoformat(comment_timestamp if isinstance(comment_timestamp, str) else str(comment_timestamp))
-            comment_dt = comment_dt.replace(tzinfo=None)
-        
-        # Ensure both are naive for comparison to avoid timezone issues
-        if due_date_dt.tzinfo is not None:
-            due_date_dt = due_date_dt.replace(tzinfo=None)
-        if comment_dt.tzinfo is not None:
-            comment_dt = comment_dt.replace(tzinfo=None)
-        
-        # Log the parsed datetime objects for debugging
-        logger.debug(f"Parsed due date: {due_date_dt} (type: {type(due_date_dt)}, tzinfo: {due_date_dt.tzinfo})")
-        logger.debug(f"Parsed comment: {comment_dt} (type: {type(comment_dt)}, tzinfo: {comment_dt.tzinfo})")
-        logger.debug(f"Comparison result: comment after due date = {comment_dt > due_date_dt}")
-        
-        # Check if the comment was posted after the due date change
-        if comment_dt > due_date_dt:
-            logger.info(f"Notifications muted for card {card_id}: Comment found after due date change")
-            return {
-                "notifications_muted": True,
-                "reason": "Comment added after due date change"
-            }
-    except Exception as e:
-        logger.error(f"Error comparing timestamps for card {card_id}: {str(e)}")
-        logger.error(f"Debug - due_date_updated_at type: {type(due_date_updated_at)}, value: {due_date_updated_at}")
-        logger.error(f"Debug - comment_timestamp type: {type(comment_timestamp)}, value: {comment_timestamp}")
-    
     return {
         "notifications_muted": False,
         "reason": None
@@ -405,29 +526,26 @@ def get_card_notification_status(card_id):
 @app.route('/')
 def index():
     """Render the dashboard page."""
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor', None)
     per_page = 10
     is_read = request.args.get('is_read', None)
     
     if is_read is not None:
         is_read = int(is_read)
     
-    offset = (page - 1) * per_page
-    reminders = get_reminders(per_page, offset, is_read)
+    reminders, next_cursor = get_reminders(per_page, decode_reminder_cursor(cursor), is_read)
     
-    # Count total for pagination
+    # Total shown alongside the pagination links
     total = count_reminders(is_read)
-    total_pages = (total + per_page - 1) // per_page
-    
-    # Update card database to get latest info
-    update_cards_database()
     
     return render_template(
         'index.html', 
         reminders=reminders,
-        page=page, 
-        total_pages=total_pages,
-        is_read=is_read
+        cursor=cursor,
+        next_cursor=next_cursor,
+        total=total,
+        is_read=is_read,
+        last_sync=get_last_sync()
     )
 
 @app.route('/card/<card_id>')
@@ -454,14 +572,18 @@ def card_details(card_id):
 def api_reminders():
     """API endpoint to get reminders in JSON format."""
     limit = request.args.get('limit', 50, type=int)
-    offset = request.args.get('offset', 0, type=int)
+    before = request.args.get('before', None)
     is_read = request.args.get('is_read', None)
     
     if is_read is not None:
         is_read = int(is_read)
     
-    reminders = get_reminders(limit, offset, is_read)
-    return jsonify(reminders)
+    reminders, next_cursor = get_reminders(limit, decode_reminder_cursor(before), is_read)
+    response = jsonify(reminders)
+    # Pass as ?before=<cursor> to fetch the next page
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 @app.route('/api/mark-read/<int:reminder_id>', methods=['POST'])
 def api_mark_read(reminder_id):
@@ -475,12 +597,30 @@ def api_cards():
     conn = get_db_connection(TRELLO_CARDS_DB)
     cursor = conn.cursor()
     
-    cursor.execute('SELECT * FROM cards ORDER BY due_date ASC')
-    cards = cursor.fetchall()
-    
-    conn.close()
+    # Every sync bumps last_updated, so this identifies the table contents
+    # without reading and serializing every card
+    cursor.execute('SELECT COUNT(*), MAX(last_updated) FROM cards')
+    etag = compute_etag(repr(tuple(cursor.fetchone())).encode())
+    if client_has_etag(etag):
+        return not_modified(etag)
     
-    return jsonify([dict(card) for card in cards])
+    cursor.execute('SELECT * FROM cards ORDER BY due_date ASC')
+    cursor.row_factory = None
+    columns = [column[0] for column in cursor.description]
+    
+    def generate():
+        # Serialize a batch of rows at a time instead of building the whole list in memory
+        yield b'['
+        separator = b''
+        while True:
+            rows = cursor.fetchmany(CARDS_STREAM_BATCH_SIZE)
+            if not rows:
+                break
+            yield separator + b','.join(orjson.dumps(dict(zip(columns, row))) for row in rows)
+            separator = b','
+        yield b']'
+    
+    return with_etag(app.response_class(stream_with_context(generate()), mimetype='application/json'), etag)
 
 @app.route('/api/card/<card_id>/comments')
 def api_card_comments(card_id):
@@ -508,50 +648,65 @@ def dashboard():
 @app.route('/api/dashboard-data')
 def dashboard_data():
     """API endpoint for dashboard analytics data."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Cards with due dates by list
-    cursor2 = get_db_connection(TRELLO_CARDS_DB).cursor()
-    cursor2.execute('''
-        SELECT list_name, COUNT(*) as count
-        FROM cards 
-        WHERE due_date IS NOT NULL
-        GROUP BY list_name
-    ''')
-    lists_data = [dict(row) for row in cursor2.fetchall()]
-    
-    # Due date changes over time
-    cursor.execute('''
-        SELECT DATE(created_at) as date, COUNT(*) as count
-        FROM reminders
-        GROUP BY DATE(created_at)
-        ORDER BY date
-    ''')
-    activity_data = [dict(row) for row in cursor.fetchall()]
+    cached = _dashboard_cache['payload']
+    if cached is None or time.monotonic() - _dashboard_cache['ts'] >= DASHBOARD_CACHE_TTL:
+        body = app.json.dumps(build_dashboard_data()).encode()
+        cached = (body, compute_etag(body))
+        _dashboard_cache['payload'] = cached
+        _dashboard_cache['ts'] = time.monotonic()
     
-    # Reminders status count
-    cursor.execute('''
-        SELECT is_read, COUNT(*) as count
-        FROM reminders
-        GROUP BY is_read
-    ''')
-    status_data = [dict(row) for row in cursor.fetchall()]
+    body, etag = cached
+    if client_has_etag(etag):
+        return not_modified(etag)
     
-    # Get count of notification suppressions due to comments
-    cursor.execute('''
-        SELECT COUNT(*) as count FROM reminders WHERE is_read = 1
-    ''')
-    total_read = cursor.fetchone()[0]
+    return with_etag(app.response_class(body, mimetype='application/json'), etag)
+
+def build_dashboard_data():
+    """Aggregate the dashboard analytics data from both databases."""
+    conn = get_db_connection()
+    # Query the cards database through the same connection
+    conn.execute('ATTACH DATABASE ? AS cards_db', (TRELLO_CARDS_DB,))
+    cursor = conn.cursor()
     
-    conn.close()
+    try:
+        # Cards with due dates by list
+        cursor.execute('''
+            SELECT list_name, COUNT(*) as count
+            FROM cards_db.cards 
+            WHERE due_date IS NOT NULL
+            GROUP BY list_name
+        ''')
+        lists_data = rows_to_dicts(cursor)
+        
+        # Due date changes over time
+        cursor.execute('''
+            SELECT created_date as date, COUNT(*) as count
+            FROM reminders
+            GROUP BY created_date
+            ORDER BY created_date
+        ''')
+        activity_data = rows_to_dicts(cursor)
+        
+        # Reminders status count
+        cursor.execute('''
+            SELECT is_read, COUNT(*) as count
+            FROM reminders
+            GROUP BY is_read
+        ''')
+        status_data = rows_to_dicts(cursor)
+    finally:
+        cursor.close()
+        conn.execute('DETACH DATABASE cards_db')
+    
+    # Count of notification suppressions due to comments (read reminders)
+    total_read = next((row['count'] for row in status_data if row['is_read'] == 1), 0)
     
-    return jsonify({
+    return {
         'lists': lists_data,
         'activity': activity_data,
         'status': status_data,
         'auto_suppressed': total_read  # This is an approximation
-    })
+    }
 
 @app.route('/comments')
 def comments_page():
@@ -573,25 +728,28 @@ def api_comments():
         ORDER BY cc.created_at DESC
     ''')
     
-    comments = cursor.fetchall()
-    conn.close()
+    comments = rows_to_dicts(cursor)
     
-    # Format comments for JSON response
-    formatted_comments = []
-    for comment in comments:
-        comment_dict = dict(comment)
-        
-        # Log timestamp information for debugging
-        logger.debug(f"Comment {comment_dict['comment_id']}: created_at={comment_dict['created_at']}, " +
-                    f"due_date_updated_at={comment_dict.get('due_date_updated_at')}")
-        
-        # Include the suppressed_notification field directly from database
-        # It's already determined when comments are stored
-        formatted_comments.append(comment_dict)
+    # Log timestamp information for debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        for comment in comments:
+            logger.debug("Comment %s: created_at=%s, due_date_updated_at=%s",
+                         comment['comment_id'], comment['created_at'], comment['due_date_updated_at'])
     
-    return jsonify({'comments': formatted_comments})
+    # The suppressed_notification field comes directly from the database;
+    # it's already determined when comments are stored
+    return jsonify({'comments': comments})
 
 if __name__ == '__main__':
     init_db()
     init_trello_cards_db()
-    app.run(debug=True) 
\ No newline at end of file
+    # The main thread only needed these for setup; don't hold them for the app's lifetime
+    close_thread_connections()
+    # The debugger and reloader add per-request overhead; only enable them for development.
+    # For production use gunicorn instead (see gunicorn.conf.py).
+    debug = os.getenv('FLASK_ENV') == 'development'
+    # With the reloader the app runs in a child process; only start the
+    # scheduler there so cards aren't synced twice per interval.
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_card_sync_scheduler()
+    app.run(debug=debug) 
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+gunicorn.conf.py - Production server settings for the web UI
+
+Usage:
+  gunicorn app:app
+"""
+
+import os
+import signal
+
+bind = "127.0.0.1:5000"
+workers = 4
+worker_class = "gthread"
+threads = 8
+
+def on_starting(server):
+    """Create the database schema once, in the master process, before workers fork."""
+    import app
+    app.init_db()
+    app.init_trello_cards_db()
+    # SQLite connections must not be shared with the forked workers
+    app.close_thread_connections()
+
+def when_ready(server):
+    """Run the Trello card sync in one child process of the master, not in every worker."""
+    import app
+    # Forked like a worker, from a master that holds no SQLite connections
+    pid = os.fork()
+    if pid == 0:
+        # Drop the arbiter's signal handlers so on_exit's SIGTERM stops the sync
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        try:
+            app.run_card_sync()
+        finally:
+            os._exit(0)
+    server.card_sync_pid = pid
+
+def on_exit(server):
+    """Stop the card sync process with the master."""
+    pid = getattr(server, 'card_sync_pid', None)
+    if pid is None:
+        return
+    try:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    except (ProcessLookupError, ChildProcessError):
+        # Already exited (and possibly reaped by the arbiter)
+        pass
@@ -4,34 +4,33 @@ run.py
 
 A helper script to run both the Trello monitor and web UI.
 This allows users to start everything with a single command.
+
+Both run in this one process: the monitor loop in a background thread and
+the Flask server in the main thread.
 """
 
-import os
-import sys
-import subprocess
 import threading
 import time
 import webbrowser
-import signal
-import platform
+
+import app
+import trello
 
 def run_trello_monitor():
-    """Run the Trello monitor script in a separate process."""
+    """Run the Trello monitor loop in a background thread."""
     print("Starting Trello monitor...")
-    if platform.system() == 'Windows':
-        return subprocess.Popen(['python', 'trello.py'], 
-                               creationflags=subprocess.CREATE_NEW_CONSOLE)
-    else:
-        return subprocess.Popen(['python', 'trello.py'])
+    monitor_thread = threading.Thread(target=trello.main, name="trello-monitor", daemon=True)
+    monitor_thread.start()
+    return monitor_thread
 
 def run_web_server():
-    """Run the Flask web server in a separate process."""
+    """Run the Flask web server in the main thread until interrupted."""
     print("Starting web server...")
-    if platform.system() == 'Windows':
-        return subprocess.Popen(['python', 'app.py'],
-                               creationflags=subprocess.CREATE_NEW_CONSOLE)
-    else:
-        return subprocess.Popen(['python', 'app.py'])
+    # The monitor's refresh_card_details keeps trello_cards.db current, so the
+    # web app's own card sync isn't started here
+    
+    # The reloader would re-launch this whole script in a child process
+    app.app.run(use_reloader=False)
 
 def open_browser():
     """Open the web browser to the dashboard after a short delay."""
@@ -39,42 +38,26 @@ def open_browser():
     webbrowser.open('http://localhost:5000')
     print("Opened browser to http://localhost:5000")
 
-def shutdown_handler(signum, frame):
-    """Handle shutdown signal and terminate all processes."""
-    print("\nShutting down all processes...")
-    
-    if monitor_process:
-        monitor_process.terminate()
-        print("Trello monitor stopped")
-    
-    if web_process:
-        web_process.terminate()
-        print("Web server stopped")
-    
-    print("Goodbye!")
-    sys.exit(0)
-
 if __name__ == "__main__":
-    # Set up signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, shutdown_handler)
-    if platform.system() != 'Windows':
-        signal.signal(signal.SIGTERM, shutdown_handler)
-    
-    # Start processes
-    monitor_process = run_trello_monitor()
-    web_process = run_web_server()
-    
+    # Create the schema before the monitor thread starts writing to it
+    app.init_db()
+    app.init_trello_cards_db()
+    app.close_thread_connections()
+
+    run_trello_monitor()
+
     # Open browser in a separate thread
     browser_thread = threading.Thread(target=open_browser)
     browser_thread.daemon = True
     browser_thread.start()
-    
+
     print("Both services running! Press Ctrl+C to stop")
-    
+
     try:
-        # Keep the main thread alive to handle keyboard interrupts
-        while True:
-            time.sleep(1)
+        run_web_server()
     except KeyboardInterrupt:
-        # This will be caught by the signal handler
-        pass 
\ No newline at end of file
+        pass
+
+    # The monitor and sync threads are daemons and stop with the process
+    print("\nShutting down...")
+    print("Goodbye!")
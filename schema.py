@@ -0,0 +1,133 @@
+"""
+schema.py
+
+SQLite schema shared by app.py and trello.py.
+
+Each database stores its schema version in PRAGMA user_version. migrate() runs
+only the steps newer than that version, so starting against an up-to-date
+database costs a single PRAGMA read. To change the schema, append a step to
+the database's migration list; never edit a step that has already shipped.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _add_missing_columns(conn, table, columns):
+    """Add any of `columns` (name -> definition) that `table` doesn't have yet."""
+    # table_xinfo (unlike table_info) also lists generated columns
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+    for name, definition in columns.items():
+        if name not in existing:
+            logger.info(f"Adding '{name}' column to {table} table")
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+def _cards_due_v1(conn):
+    """Baseline schema for cards_due.db, also upgrading databases created before versioning."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS card_due (
+            card_id TEXT PRIMARY KEY,
+            name TEXT,
+            due_date TEXT,
+            due_date_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            due_date_updated_epoch INTEGER
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            card_id TEXT,
+            card_name TEXT,
+            old_due TEXT,
+            new_due TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_read INTEGER DEFAULT 0,
+            created_date TEXT GENERATED ALWAYS AS (substr(created_at, 1, 10)) VIRTUAL
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS card_comments (
+            comment_id TEXT PRIMARY KEY,
+            card_id TEXT,
+            comment_text TEXT,
+            created_at TIMESTAMP,
+            created_epoch INTEGER,
+            suppressed_notification INTEGER DEFAULT 0
+        )
+    ''')
+
+    # Poller state (e.g. the date of the last processed board action)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+    # Columns added to older versions of the tables above
+    _add_missing_columns(conn, 'card_due', {
+        'name': 'TEXT',
+        'due_date_updated_epoch': 'INTEGER',
+    })
+    _add_missing_columns(conn, 'card_comments', {
+        'suppressed_notification': 'INTEGER DEFAULT 0',
+        'created_epoch': 'INTEGER',
+    })
+    _add_missing_columns(conn, 'reminders', {
+        'created_date': 'TEXT GENERATED ALWAYS AS (substr(created_at, 1, 10)) VIRTUAL',
+    })
+    conn.execute('''
+        UPDATE card_due SET due_date_updated_epoch = CAST(strftime('%s', due_date_updated_at) AS INTEGER)
+        WHERE due_date_updated_epoch IS NULL
+    ''')
+    conn.execute('''
+        UPDATE card_comments SET created_epoch = CAST(strftime('%s', created_at) AS INTEGER)
+        WHERE created_epoch IS NULL
+    ''')
+
+    # Reminder listing (ascending, so ORDER BY created_at DESC, id DESC walks the index
+    # backwards) and per-card comment lookups
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_created ON reminders(created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_isread_created ON reminders(is_read, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_date ON reminders(created_date)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_comments_card_created ON card_comments(card_id, created_at DESC)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_comments_card_epoch ON card_comments(card_id, created_epoch)')
+
+def _trello_cards_v1(conn):
+    """Baseline schema for trello_cards.db."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cards (
+            card_id TEXT PRIMARY KEY,
+            name TEXT,
+            description TEXT,
+            url TEXT,
+            list_name TEXT,
+            due_date TEXT,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_cards_due ON cards(due_date)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_cards_list_due ON cards(list_name, due_date)')
+
+# Migration steps per database; step N brings the database to user_version N + 1
+CARDS_DUE_MIGRATIONS = [_cards_due_v1]
+TRELLO_CARDS_MIGRATIONS = [_trello_cards_v1]
+
+def migrate(conn, migrations):
+    """Apply the `migrations` newer than the database's user_version in one transaction."""
+    target = len(migrations)
+    if conn.execute('PRAGMA user_version').fetchone()[0] >= target:
+        return
+
+    with conn:
+        conn.execute('BEGIN IMMEDIATE')
+        # Re-read under the write lock in case another process migrated in the meantime
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for step in migrations[version:]:
+            logger.info(f"Applying schema migration {step.__name__}")
+            step(conn)
+        if version < target:
+            conn.execute(f'PRAGMA user_version = {target}')
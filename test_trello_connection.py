@@ -1,8 +1,11 @@
 import os
-import json
 import logging
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging to console for debugging
 logging.basicConfig(
@@ -18,6 +21,28 @@ TRELLO_API_KEY = os.getenv('TRELLO_API_KEY')
 TRELLO_TOKEN = os.getenv('TRELLO_TOKEN')
 TRELLO_BOARD_ID = os.getenv('TRELLO_BOARD_ID')
 
+# Shared HTTP session so the tests reuse one TLS connection to api.trello.com
+SESSION = requests.Session()
+SESSION.params = {'key': TRELLO_API_KEY, 'token': TRELLO_TOKEN}
+SESSION.headers['Accept'] = 'application/json'
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Back off exponentially on rate limits and server errors, honouring Retry-After;
+    # the final error response is returned so callers' raise_for_status() handles it
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=['GET'],
+        raise_on_status=False
+    )
+))
+
+# (connect, read) timeout in seconds for Trello API calls
+REQUEST_TIMEOUT = (5, 30)
+
 def test_trello_connection():
     """Test if we can connect to Trello API successfully."""
     logging.info("Testing Trello API connection...")
@@ -27,15 +52,11 @@ def test_trello_connection():
         return False
     
     url = "https://api.trello.com/1/members/me"
-    params = {
-        'key': TRELLO_API_KEY,
-        'token': TRELLO_TOKEN
-    }
     
     try:
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        user_data = response.json()
+        user_data = orjson.loads(response.content)
         logging.info(f"✅ Successfully connected to Trello API as: {user_data.get('fullName', user_data.get('username'))}")
         return True
     except Exception as e:
@@ -52,15 +73,13 @@ def test_board_access():
     
     url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}"
     params = {
-        'key': TRELLO_API_KEY,
-        'token': TRELLO_TOKEN,
         'fields': 'name,url'
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        board_data = response.json()
+        board_data = orjson.loads(response.content)
         logging.info(f"✅ Successfully accessed board: {board_data.get('name')}")
         logging.info(f"   Board URL: {board_data.get('url')}")
         return True
@@ -74,15 +93,13 @@ def test_board_activity():
     
     url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/actions"
     params = {
-        'key': TRELLO_API_KEY,
-        'token': TRELLO_TOKEN,
         'limit': 10  # Get just the 10 most recent actions
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        actions = response.json()
+        actions = orjson.loads(response.content)
         
         if actions:
             logging.info(f"✅ Successfully retrieved {len(actions)} recent activities")
@@ -129,13 +146,17 @@ def run_all_tests():
         logging.error("❌ CRITICAL: Cannot connect to Trello API. Check your API key and token.")
         return False
     
-    board_ok = test_board_access()
+    # The board and activity checks are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        board_future = executor.submit(test_board_access)
+        activity_future = executor.submit(test_board_activity)
+        board_ok = board_future.result()
+        activity_ok = activity_future.result()
+    
     if not board_ok:
         logging.error("❌ CRITICAL: Cannot access the specified board. Check your board ID.")
         return False
     
-    activity_ok = test_board_activity()
-    
     if connection_ok and board_ok and activity_ok:
         logging.info("✅ All tests passed! Your polling.py should work correctly.")
         return True
@@ -18,11 +18,19 @@ Usage:
 
 import os
 import sqlite3
+import orjson
 import requests
+import schema
 import time
 import logging
-from datetime import datetime
+import threading
+import functools
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Set up logging
 logging.basicConfig(
@@ -44,479 +52,609 @@ TRELLO_TOKEN = os.getenv("TRELLO_TOKEN")
 TRELLO_BOARD_ID = os.getenv("TRELLO_BOARD_ID")
 REMINDER_DELAY_HOURS = float(os.getenv("REMINDER_DELAY_HOURS", "24"))
 
-# Debug prints
-print(f"Using API Key: {TRELLO_API_KEY[:4]}...{TRELLO_API_KEY[-4:] if len(TRELLO_API_KEY) > 8 else ''}")
-print(f"Using Token: {TRELLO_TOKEN[:4]}...{TRELLO_TOKEN[-4:] if len(TRELLO_TOKEN) > 8 else ''}")
+# Debug prints (main() reports missing variables)
+if TRELLO_API_KEY and TRELLO_TOKEN:
+    print(f"Using API Key: {TRELLO_API_KEY[:4]}...{TRELLO_API_KEY[-4:] if len(TRELLO_API_KEY) > 8 else ''}")
+    print(f"Using Token: {TRELLO_TOKEN[:4]}...{TRELLO_TOKEN[-4:] if len(TRELLO_TOKEN) > 8 else ''}")
 print(f"Using Board ID: {TRELLO_BOARD_ID}")
 
 # Polling interval in seconds
 POLL_INTERVAL_MINUTES = float(os.getenv("POLL_INTERVAL_MINUTES", "1"))
 POLL_INTERVAL = POLL_INTERVAL_MINUTES * 60
 
+# Upper bound for the poll interval when the board is quiet, in seconds
+MAX_POLL_INTERVAL = max(POLL_INTERVAL, float(os.getenv("MAX_POLL_INTERVAL_MINUTES", "15")) * 60)
+
+# How often the full card details for the web UI are refreshed, in seconds
+FULL_SYNC_INTERVAL = float(os.getenv("FULL_SYNC_INTERVAL_MINUTES", "15")) * 60
+
+# Maximum number of board actions fetched per poll; a full page means we may have
+# missed some and fall back to a full card check
+ACTIONS_PAGE_LIMIT = 1000
+
+# Card actions needed when a due date changes: updateCard for the change time,
+# commentCard for the comment check. Both come back from one request.
+CARD_ACTIONS_FILTER = "updateCard,commentCard"
+CARD_ACTIONS_LIMIT = 200
+# The full card check gets each card's most recent actions inline with the cards
+INLINE_ACTIONS_LIMIT = 20
+
+# Trello's /1/batch endpoint accepts at most 10 URLs per request
+BATCH_SIZE = 10
+# Batch requests in flight at once; small enough to stay well under Trello's
+# rate limit, and 429s are retried by SESSION with Retry-After
+BATCH_CONCURRENCY = 4
+
 # Database files
 CARDS_DUE_DB = 'cards_due.db'
 TRELLO_CARDS_DB = 'trello_cards.db'
 
-def init_db():
-    """Initialize the SQLite database with required tables."""
-    conn = sqlite3.connect(CARDS_DUE_DB)
-    c = conn.cursor()
-    
-    # Create table for card due dates
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS card_due (
-            card_id TEXT PRIMARY KEY,
-            name TEXT,
-            due_date TEXT,
-            due_date_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Create table for due date change reminders
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS reminders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            card_id TEXT,
-            card_name TEXT,
-            old_due TEXT,
-            new_due TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_read INTEGER DEFAULT 0
-        )
-    ''')
-    
-    # Create table for card comments
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS card_comments (
-            comment_id TEXT PRIMARY KEY,
-            card_id TEXT,
-            comment_text TEXT,
-            created_at TIMESTAMP,
-            suppressed_notification INTEGER DEFAULT 0
-        )
-    ''')
-    
-    # Check if name column exists in card_due table, add it if it doesn't
+# Shared HTTP session: reuses the keep-alive TLS connection to api.trello.com
+# and sends the API credentials with every request
+SESSION = requests.Session()
+SESSION.params = {"key": TRELLO_API_KEY, "token": TRELLO_TOKEN}
+SESSION.headers["Accept"] = "application/json"
+# requests sends this by default; set it explicitly so the compressed transfer doesn't depend on that
+SESSION.headers["Accept-Encoding"] = "gzip, deflate"
+SESSION.mount("https://", HTTPAdapter(
+    # Everything goes to api.trello.com; pool_maxsize bounds concurrent requests
+    pool_connections=4,
+    pool_maxsize=16,
+    # Back off exponentially on rate limits and server errors, honouring Retry-After;
+    # the final error response is returned so callers' raise_for_status() handles it
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET"],
+        raise_on_status=False
+    )
+))
+
+# (connect, read) timeout in seconds for Trello API calls
+REQUEST_TIMEOUT = (5, 30)
+
+def parse_json(response):
+    """Parse a Trello response body with orjson, straight from the decompressed bytes."""
+    return orjson.loads(response.content)
+
+@functools.lru_cache(maxsize=4096)
+def to_epoch(ts):
+    """
+    Convert an ISO 8601 timestamp (Trello's 'Z' form or a naive one from SQLite)
+    to Unix epoch seconds. Naive timestamps are taken as UTC, like strftime('%s').
+    Returns None if the timestamp can't be parsed.
+    """
+    if not ts:
+        return None
     try:
-        c.execute("SELECT name FROM card_due LIMIT 1")
-    except sqlite3.OperationalError:
-        # Column doesn't exist, add it
-        logger.info("Adding 'name' column to card_due table")
-        c.execute("ALTER TABLE card_due ADD COLUMN name TEXT")
+        dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+    except ValueError:
+        logger.error(f"Could not parse timestamp: {ts}")
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+def _fetch_batch(chunk):
+    """Fetch up to BATCH_SIZE paths with one /1/batch request; see trello_batch."""
+    # The urls are comma separated, so commas inside a path must be escaped
+    urls = ",".join(path.replace(",", "%2C") for path in chunk)
     
-    # Check if suppressed_notification column exists in card_comments table, add it if it doesn't
     try:
-        c.execute("SELECT suppressed_notification FROM card_comments LIMIT 1")
-    except sqlite3.OperationalError:
-        # Column doesn't exist, add it
-        logger.info("Adding 'suppressed_notification' column to card_comments table")
-        c.execute("ALTER TABLE card_comments ADD COLUMN suppressed_notification INTEGER DEFAULT 0")
-    
-    conn.commit()
-    conn.close()
+        response = SESSION.get("https://api.trello.com/1/batch", params={"urls": urls}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Error fetching Trello batch: {str(e)}")
+        return [(None, None)] * len(chunk)
+    
+    # Each item is {"200": body} on success, or an error object with a statusCode
+    results = []
+    for item in parse_json(response):
+        status = next(iter(item)) if len(item) == 1 else None
+        if status and status.isdigit():
+            results.append((int(status), item[status]))
+        else:
+            results.append((item.get("statusCode"), item))
+    return results
+
+def trello_batch(paths):
+    """
+    Fetch several Trello API GET paths (e.g. "/cards/{id}/actions?filter=updateCard")
+    through the /1/batch endpoint, 10 per request, with a few requests in flight at once.
+    Returns a (status, body) pair per path, in order; failed batches yield (None, None).
+    """
+    chunks = [paths[i:i + BATCH_SIZE] for i in range(0, len(paths), BATCH_SIZE)]
+    if len(chunks) <= 1:
+        return [result for chunk in chunks for result in _fetch_batch(chunk)]
     
+    with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(chunks))) as executor:
+        return [result for chunk_results in executor.map(_fetch_batch, chunks) for result in chunk_results]
+
+# (url, params) -> (ETag, Last-Modified, parsed body) of the last 200 response
+# from conditional_get, so a 304 can be answered from memory
+CONDITIONAL_CACHE = {}
+
+# list_id -> (cached_at, list name), shared across polling cycles. List names
+# rarely change, so each entry is trusted for LIST_CACHE_TTL seconds.
+LIST_NAME_CACHE = {}
+LIST_CACHE_TTL = 3600
+
+# Applied to every connection when it is opened. WAL lets the web UI keep reading
+# while a poll cycle's transaction is open; synchronous=NORMAL is safe with WAL
+# and only fsyncs at checkpoints instead of on every commit.
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-64000',
+    'PRAGMA mmap_size=134217728',
+)
+
+# Long-lived connections, one per database file, opened on first use.
+# They are shared across threads (e.g. run.py), so all use goes through _db_lock.
+_connections = {}
+_db_lock = threading.RLock()
+
+def get_connection(database=CARDS_DUE_DB):
+    """Return the long-lived connection to `database`, opening it on first use."""
+    with _db_lock:
+        conn = _connections.get(database)
+        if conn is None:
+            # A larger statement cache keeps every hot statement below prepared
+            conn = sqlite3.connect(database, check_same_thread=False, cached_statements=256)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            _connections[database] = conn
+        return conn
+
+# Statements run once per card or comment. Keeping each as a single constant
+# string means every call hits the connection's prepared statement cache.
+UPDATE_CARD_NAME_SQL = 'UPDATE card_due SET name = ? WHERE card_id = ? AND name IS NOT ?'
+
+GET_STORED_DUE_DATE_SQL = 'SELECT due_date, due_date_updated_at, name FROM card_due WHERE card_id = ?'
+
+UPSERT_DUE_DATE_SQL = '''
+    INSERT INTO card_due (card_id, name, due_date, due_date_updated_at, due_date_updated_epoch)
+    VALUES (?, ?, ?, ?, CAST(strftime('%s', ?) AS INTEGER))
+    ON CONFLICT(card_id) DO UPDATE SET
+        name = excluded.name,
+        due_date = excluded.due_date,
+        due_date_updated_at = excluded.due_date_updated_at,
+        due_date_updated_epoch = excluded.due_date_updated_epoch
+'''
+
+INSERT_REMINDER_SQL = '''
+    INSERT INTO reminders (card_id, card_name, old_due, new_due, is_read)
+    VALUES (?, ?, ?, ?, ?)
+    RETURNING id
+'''
+
+UPSERT_COMMENT_SQL = '''
+    INSERT OR REPLACE INTO card_comments 
+    (comment_id, card_id, comment_text, created_at, created_epoch, suppressed_notification)
+    VALUES (?, ?, ?, ?, CAST(strftime('%s', ?) AS INTEGER), ?)
+'''
+
+COMMENT_AFTER_DUE_CHANGE_SQL = '''
+    SELECT 1 FROM card_comments c
+    JOIN card_due d ON d.card_id = c.card_id
+    WHERE c.card_id = ? AND c.created_epoch > d.due_date_updated_epoch
+    LIMIT 1
+'''
+
+UPSERT_CARD_DETAILS_SQL = '''
+    INSERT INTO cards (card_id, name, description, url, list_name, due_date)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(card_id) DO UPDATE SET
+        name = excluded.name,
+        description = excluded.description,
+        url = excluded.url,
+        list_name = excluded.list_name,
+        due_date = excluded.due_date,
+        last_updated = CURRENT_TIMESTAMP
+'''
+
+@contextmanager
+def read_connection(conn=None, database=CARDS_DUE_DB):
+    """Yield `conn`, or the long-lived connection to `database` while holding _db_lock."""
+    if conn is not None:
+        yield conn
+        return
+    with _db_lock:
+        yield get_connection(database)
+
+@contextmanager
+def db_connection(conn=None, database=CARDS_DUE_DB):
+    """
+    Yield `conn` if the caller passed one (it owns the transaction), otherwise
+    the long-lived connection to `database`, committing when the block exits.
+    Read-only helpers skip this and use read_connection() since there's nothing to commit.
+    """
+    if conn is not None:
+        yield conn
+        return
+    with _db_lock:
+        conn = get_connection(database)
+        with conn:
+            # Take the write lock up front so the whole block commits as one
+            # transaction, instead of upgrading from a read lock part way through
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+
+def init_db():
+    """Initialize the SQLite database and bring its schema up to date."""
+    with _db_lock:
+        schema.migrate(get_connection(CARDS_DUE_DB), schema.CARDS_DUE_MIGRATIONS)
     logger.info("Database initialized successfully")
 
-def get_stored_due_date(card_id):
+def init_cards_db():
+    """Initialize the Trello cards database used by the web UI."""
+    with _db_lock:
+        schema.migrate(get_connection(TRELLO_CARDS_DB), schema.TRELLO_CARDS_MIGRATIONS)
+
+def get_meta(key, conn=None):
+    """Read a value from the meta table, or None if it isn't set."""
+    with read_connection(conn) as db:
+        c = db.cursor()
+        c.execute("SELECT value FROM meta WHERE key = ?", (key,))
+        row = c.fetchone()
+    return row[0] if row else None
+
+def set_meta(key, value, conn=None):
+    """Store a value in the meta table."""
+    with db_connection(conn) as db:
+        c = db.cursor()
+        c.execute('''
+            INSERT INTO meta (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        ''', (key, value))
+
+def get_stored_due_date(card_id, conn=None):
     """Retrieve the stored due date for a specific card from the database."""
-    conn = sqlite3.connect(CARDS_DUE_DB)
-    c = conn.cursor()
-    c.execute("SELECT due_date, due_date_updated_at FROM card_due WHERE card_id = ?", (card_id,))
-    row = c.fetchone()
-    conn.close()
+    with read_connection(conn) as db:
+        c = db.cursor()
+        c.execute(GET_STORED_DUE_DATE_SQL, (card_id,))
+        row = c.fetchone()
     if row:
-        return {"due_date": row[0], "updated_at": row[1]}
-    return {"due_date": None, "updated_at": None}
+        return {"due_date": row[0], "updated_at": row[1], "name": row[2]}
+    return {"due_date": None, "updated_at": None, "name": None}
 
-def get_due_date_change_time_from_trello(card_id):
+def load_all_stored(conn=None):
     """
-    Get the actual timestamp when the due date was last changed from Trello API.
-    Returns ISO timestamp string or None if no due date change found.
+    Return a {card_id: {"due_date", "updated_at", "name"}} snapshot of every stored card,
+    in the same shape as get_stored_due_date.
     """
-    # Trello API credentials
-    api_key = os.getenv("TRELLO_API_KEY")
-    api_token = os.getenv("TRELLO_TOKEN")  # Make sure this matches your env var name
-    
-    # Log the credentials being used (without revealing full values)
-    logger.debug(f"Using API key starting with: {api_key[:4]}... and token: {api_token[:4]}..." if api_key and api_token else "Missing API credentials")
-    
-    if not api_key or not api_token:
+    with read_connection(conn) as db:
+        rows = db.execute("SELECT card_id, due_date, due_date_updated_at, name FROM card_due").fetchall()
+    return {
+        card_id: {"due_date": due_date, "updated_at": updated_at, "name": name}
+        for card_id, due_date, updated_at, name in rows
+    }
+
+def get_card_actions(card_id):
+    """
+    Get a card's recent updateCard and commentCard actions in one request, newest first.
+    Returns an empty list on errors.
+    """
+    # The credentials are sent by SESSION; make sure they're configured
+    if not TRELLO_API_KEY or not TRELLO_TOKEN:
         logger.error("Missing Trello API credentials. Check your .env file.")
-        return None
+        return []
     
-    # Build API URL to get card actions with updateCard filter for due date changes
     api_url = f"https://api.trello.com/1/cards/{card_id}/actions"
     params = {
-        "key": api_key,
-        "token": api_token,
-        "filter": "updateCard",
-        "limit": 100  # Get enough actions to find due date changes
+        "filter": CARD_ACTIONS_FILTER,
+        "limit": CARD_ACTIONS_LIMIT
     }
     
     try:
-        logger.debug(f"Making API request to {api_url} with filter=updateCard")
-        response = requests.get(api_url, params=params)
+        logger.debug("Making API request to %s with filter=%s", api_url, CARD_ACTIONS_FILTER)
+        response = SESSION.get(api_url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        actions = response.json()
-        
-        # Find the most recent due date change action
-        for action in actions:
-            # Check if this action involved changing the due date
-            if "data" in action and "card" in action["data"]:
-                if "due" in action["data"]["card"]:
-                    # Found a due date change, return its timestamp
-                    logger.debug(f"Found due date change action: {action['date']} for card {card_id}")
-                    return action["date"]  # This is the ISO timestamp of the action
-        
-        logger.debug(f"No due date change actions found for card {card_id}")
-        return None
+        return parse_json(response)
     except Exception as e:
-        logger.error(f"Error fetching due date change time from Trello for card {card_id}: {str(e)}")
-        return None
+        logger.error(f"Error fetching actions from Trello for card {card_id}: {str(e)}")
+        return []
+
+def get_due_date_change_time_from_trello(card_id, actions=None):
+    """
+    Get the actual timestamp when the due date was last changed from Trello API.
+    Returns ISO timestamp string or None if no due date change found.
+    Pass the card's `actions` if they were already fetched (see get_card_actions).
+    """
+    if actions is None:
+        actions = get_card_actions(card_id)
+    
+    # Find the most recent due date change action
+    for action in actions:
+        # Check if this action involved changing the due date
+        if action.get("type") == "updateCard" and "due" in action.get("data", {}).get("card", {}):
+            # Found a due date change, return its timestamp
+            logger.debug("Found due date change action: %s for card %s", action['date'], card_id)
+            return action["date"]  # This is the ISO timestamp of the action
+    
+    logger.debug("No due date change actions found for card %s", card_id)
+    return None
 
-def update_stored_due_date(card_id, card_name, new_due_date, old_due_date=None):
-    """Update the stored due date for a card, creating a new record if needed."""
+def update_stored_due_date(card_id, card_name, new_due_date, old_due_date=None, changed_at=None, conn=None, actions=None):
+    """Update the stored due date for a card, creating a new record if needed.
+    
+    changed_at is the Trello action date of the change, when the caller already has it.
+    actions is the card's prefetched actions (see get_card_actions), e.g. from trello_batch.
+    """
+    needs_reminder = old_due_date is not None and old_due_date != new_due_date
+    
+    # One request serves both the change time and the comments check
+    if actions is None and (not changed_at or needs_reminder):
+        actions = get_card_actions(card_id)
     
     # Get the actual timestamp from Trello when the due date was changed
-    trello_change_time = get_due_date_change_time_from_trello(card_id)
+    trello_change_time = changed_at or get_due_date_change_time_from_trello(card_id, actions)
     
     # If we couldn't get the timestamp from Trello, use current time as fallback
     timestamp = trello_change_time if trello_change_time else datetime.now().isoformat()
     
-    logger.debug(f"Updating stored due date for card {card_id} with timestamp {timestamp}")
-    
-    conn = sqlite3.connect(CARDS_DUE_DB)
-    c = conn.cursor()
-    
-    # Check if the card already exists in the database
-    c.execute('SELECT * FROM card_due WHERE card_id = ?', (card_id,))
-    result = c.fetchone()
-    
-    if result:
-        c.execute('''
-            UPDATE card_due 
-            SET due_date = ?, due_date_updated_at = ?, name = ?
-            WHERE card_id = ?
-        ''', (new_due_date, timestamp, card_name, card_id))
-    else:
-        c.execute('''
-            INSERT INTO card_due (card_id, name, due_date, due_date_updated_at)
-            VALUES (?, ?, ?, ?)
-        ''', (card_id, card_name, new_due_date, timestamp))
+    logger.debug("Updating stored due date for card %s with timestamp %s", card_id, timestamp)
     
-    conn.commit()
-    conn.close()
+    with db_connection(conn) as db:
+        db.execute(UPSERT_DUE_DATE_SQL, (card_id, card_name, new_due_date, timestamp, timestamp))
     
     # If this is a due date change (not a new card), send reminder
-    if old_due_date is not None and old_due_date != new_due_date:
-        send_reminder(card_id, card_name, old_due_date, new_due_date)
-
-def add_reminder(card_id, card_name, old_due, new_due):
-    """Add a reminder to the reminders table."""
-    conn = sqlite3.connect(CARDS_DUE_DB)
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO reminders (card_id, card_name, old_due, new_due)
-        VALUES (?, ?, ?, ?)
-    ''', (card_id, card_name, old_due, new_due))
-    conn.commit()
-    conn.close()
-
-def get_last_comment_timestamp(card_id):
+    if needs_reminder:
+        send_reminder(card_id, card_name, old_due_date, new_due_date, conn, actions)
+
+def add_reminder(card_id, card_name, old_due, new_due, conn=None, is_read=False):
+    """Add a reminder to the reminders table and return its id."""
+    with db_connection(conn) as db:
+        c = db.cursor()
+        c.execute(INSERT_REMINDER_SQL, (card_id, card_name, old_due, new_due, 1 if is_read else 0))
+        return c.fetchone()[0]
+
+def get_last_comment_timestamp(card_id, conn=None):
     """Get the timestamp of the most recent comment on a card."""
-    conn = sqlite3.connect(CARDS_DUE_DB)
-    c = conn.cursor()
-    c.execute('''
-        SELECT created_at FROM card_comments 
-        WHERE card_id = ? 
-        ORDER BY created_at DESC 
-        LIMIT 1
-    ''', (card_id,))
-    result = c.fetchone()
-    conn.close()
+    with read_connection(conn) as db:
+        c = db.cursor()
+        c.execute('''
+            SELECT created_at FROM card_comments 
+            WHERE card_id = ? 
+            ORDER BY created_at DESC 
+            LIMIT 1
+        ''', (card_id,))
+        result = c.fetchone()
     
     if result:
         return result[0]
     return None
 
-def store_card_comment(comment_id, card_id, comment_text, created_at):
-    """Store a card comment in the database."""
-    conn = sqlite3.connect(CARDS_DUE_DB)
-    c = conn.cursor()
-    c.execute('''
-        INSERT OR REPLACE INTO card_comments 
-        (comment_id, card_id, comment_text, created_at)
-        VALUES (?, ?, ?, ?)
-    ''', (comment_id, card_id, comment_text, created_at))
-    conn.commit()
-    conn.close()
-
-def get_card_comments(card_id):
+def get_card_comments(card_id, conn=None, actions=None):
     """
     Get all comments for a specific card from Trello API.
     Returns the timestamp of the latest comment and stores all comments in the DB.
+    Pass the card's `actions` if they were already fetched (see get_card_actions);
+    only the commentCard ones are used.
     """
-    # Trello API credentials
-    api_key = os.getenv("TRELLO_API_KEY")
-    api_token = os.getenv("TRELLO_TOKEN")  # Make sure this matches your env var name
-    
-    # Log the credentials being used (without revealing full values)
-    logger.debug(f"Using API key starting with: {api_key[:4]}... and token: {api_token[:4]}..." if api_key and api_token else "Missing API credentials")
-    
-    if not api_key or not api_token:
-        logger.error("Missing Trello API credentials. Check your .env file.")
-        return None
-    
-    # Build API URL to get card actions with commentCard filter
-    api_url = f"https://api.trello.com/1/cards/{card_id}/actions"
-    params = {
-        "key": api_key,
-        "token": api_token,  # This was missing or named incorrectly
-        "filter": "commentCard",
-        "limit": 100  # Adjust if you need more comments
-    }
+    if actions is None:
+        actions = get_card_actions(card_id)
+    comments = [action for action in actions if action.get("type") == "commentCard"]
     
     try:
-        logger.debug(f"Making API request to {api_url} with params: {params}")
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()
-        
         # Get the card's due date change time for comparison
-        due_date_info = get_stored_due_date(card_id)
+        due_date_info = get_stored_due_date(card_id, conn)
         due_date_changed_at = due_date_info.get("updated_at")
         
-        # Parse due date change time for comparison
-        if due_date_changed_at:
-            try:
-                if 'Z' in due_date_changed_at:
-                    due_date_dt = datetime.fromisoformat(due_date_changed_at.replace('Z', '+00:00'))
-                else:
-                    due_date_dt = datetime.fromisoformat(due_date_changed_at)
-                # Make it naive to ensure consistent comparison
-                if due_date_dt.tzinfo is not None:
-                    due_date_dt = due_date_dt.replace(tzinfo=None)
-            except Exception as e:
-                logger.error(f"Error parsing due date change time for card {card_id}: {str(e)}")
-                due_date_dt = None
-        else:
-            due_date_dt = None
+        due_date_epoch = to_epoch(due_date_changed_at)
         
         # Process comments
-        comments = response.json()
-        
         if not comments:
-            logger.debug(f"No comments found for card {card_id}")
+            logger.debug("No comments found for card %s", card_id)
             return None
         
-        # Connect to database
-        conn = sqlite3.connect(CARDS_DUE_DB)
-        c = conn.cursor()
-        
         # Store all comments
-        latest_timestamp = None
+        rows = []
         for comment in comments:
             comment_id = comment["id"]
             comment_text = comment["data"]["text"]
             created_at = comment["date"]
-            
-            # Check if this comment suppressed a notification
+        
+            # A comment posted after the due date change suppresses the notification
             suppressed_notification = False
-            if due_date_dt:
-                try:
-                    # Parse comment date for comparison
-                    if 'Z' in created_at:
-                        comment_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    else:
-                        comment_dt = datetime.fromisoformat(created_at)
-                    
-                    # Make it naive for comparison
-                    if comment_dt.tzinfo is not None:
-                        comment_dt = comment_dt.replace(tzinfo=None)
-                    
-                    # Check if this comment was posted after due date change
-                    suppressed_notification = comment_dt > due_date_dt
-                    
-                    logger.debug(f"Comment timestamp: {created_at}, Due date change: {due_date_changed_at}")
-                    logger.debug(f"Comment suppressed notification: {suppressed_notification}")
-                except Exception as e:
-                    logger.error(f"Error comparing dates for comment {comment_id}: {str(e)}")
-            
-            # Store comment in database
-            c.execute('''
-                INSERT OR REPLACE INTO card_comments 
-                (comment_id, card_id, comment_text, created_at, suppressed_notification)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (comment_id, card_id, comment_text, created_at, 1 if suppressed_notification else 0))
-            
-            # Update latest comment timestamp
-            if latest_timestamp is None or created_at > latest_timestamp:
-                latest_timestamp = created_at
+            if due_date_epoch is not None:
+                comment_epoch = to_epoch(created_at)
+                suppressed_notification = comment_epoch is not None and comment_epoch > due_date_epoch
+                logger.debug("Comment timestamp: %s, Due date change: %s", created_at, due_date_changed_at)
+                logger.debug("Comment suppressed notification: %s", suppressed_notification)
         
-        conn.commit()
-        conn.close()
+            # Collect the comment row; all rows are written with one executemany below
+            rows.append((comment_id, card_id, comment_text, created_at, created_at, 1 if suppressed_notification else 0))
         
-        return latest_timestamp
+        with db_connection(conn) as db:
+            db.executemany(UPSERT_COMMENT_SQL, rows)
+        
+        # Trello's ISO 8601 UTC timestamps sort chronologically as strings
+        return max(row[3] for row in rows)
     except Exception as e:
         logger.error(f"Error retrieving comments for card {card_id}: {str(e)}")
         return None
 
-def has_comment_after_due_date_change(card_id):
-    """Check if there's a comment posted after the last due date change."""
-    due_date_info = get_stored_due_date(card_id)
+# Cards whose comments were fetched and stored during the current poll cycle
+COMMENTS_FETCHED = set()
+
+def has_comment_after_due_date_change(card_id, conn=None, actions=None):
+    """
+    Check if there's a comment posted after the last due date change.
+    Comments already stored are checked first; Trello is only asked when none
+    match and the card's comments haven't been fetched this poll cycle.
+    """
+    due_date_info = get_stored_due_date(card_id, conn)
     if not due_date_info["updated_at"]:
         return False
     
     due_date_updated_at = due_date_info["updated_at"]
     
+    with read_connection(conn) as db:
+        if db.execute(COMMENT_AFTER_DUE_CHANGE_SQL, (card_id,)).fetchone():
+            return True
+    if card_id in COMMENTS_FETCHED:
+        return False
+    
     # Get the most recent comment from Trello API and store it
-    latest_comment_timestamp = get_card_comments(card_id)
+    latest_comment_timestamp = get_card_comments(card_id, conn, actions)
+    COMMENTS_FETCHED.add(card_id)
     
     if not latest_comment_timestamp:
         return False
     
     # Log the raw timestamps for debugging
-    logger.debug(f"Card ID: {card_id}")
-    logger.debug(f"Due date changed at: {due_date_updated_at}")
-    logger.debug(f"Latest comment at: {latest_comment_timestamp}")
+    logger.debug("Card ID: %s, due date changed at: %s, latest comment at: %s",
+                 card_id, due_date_updated_at, latest_comment_timestamp)
     
-    # Convert both timestamps to datetime objects for comparison
-    try:
-        # Handle potential timezone issues by ensuring both are in the same format
-        # For due_date_updated_at from SQLite
-        if 'Z' in due_date_updated_at:
-            due_date_dt = datetime.fromisoformat(due_date_updated_at.replace('Z', '+00:00'))
-        else:
-            # If it's a naive datetime string from SQLite (no Z or timezone info)
-            due_date_dt = datetime.fromisoformat(due_date_updated_at)
-            # Make it timezone-aware by assuming UTC
-            due_date_dt = due_date_dt.replace(tzinfo=None)
-        
-        # For latest_comment_timestamp from Trello API
-        if 'Z' in latest_comment_timestamp:
-            comment_dt = datetime.fromisoformat(latest_comment_timestamp.replace('Z', '+00:00'))
-        else:
-            comment_dt = datetime.fromisoformat(latest_comment_timestamp)
-            comment_dt = comment_dt.replace(tzinfo=None)
-        
-        # Ensure both are naive for comparison to avoid timezone issues
-        if due_date_dt.tzinfo is not None:
-            due_date_dt = due_date_dt.replace(tzinfo=None)
-        if comment_dt.tzinfo is not None:
-            comment_dt = comment_dt.replace(tzinfo=None)
-        
-        # Log the parsed datetime objects for debugging
-        logger.debug(f"Parsed due date: {due_date_dt} (type: {type(due_date_dt)}, tzinfo: {due_date_dt.tzinfo})")
-        logger.debug(f"Parsed comment: {comment_dt} (type: {type(comment_dt)}, tzinfo: {comment_dt.tzinfo})")
-        logger.debug(f"Comparison result: comment after due date = {comment_dt > due_date_dt}")
-            
-        # Check if the comment was posted after the due date change
-        return comment_dt > due_date_dt
-    except Exception as e:
-        logger.error(f"Error comparing timestamps for card {card_id}: {str(e)}")
-        logger.error(f"Debug - due_date_updated_at: {due_date_updated_at} (type: {type(due_date_updated_at)})")
-        logger.error(f"Debug - latest_comment_timestamp: {latest_comment_timestamp} (type: {type(latest_comment_timestamp)})")
+    due_date_epoch = to_epoch(due_date_updated_at)
+    comment_epoch = to_epoch(latest_comment_timestamp)
+    if due_date_epoch is None or comment_epoch is None:
         return False
+    
+    logger.debug("Comparison result: comment after due date = %s", comment_epoch > due_date_epoch)
+    return comment_epoch > due_date_epoch
+
+def conditional_get(url, params=None):
+    """
+    GET a Trello URL, revalidating the previous response with If-None-Match and
+    If-Modified-Since. Returns (body, modified): the parsed body, or the cached
+    one with modified=False when Trello answers 304.
+    """
+    key = (url, frozenset((params or {}).items()))
+    cached = CONDITIONAL_CACHE.get(key)
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
+    response = SESSION.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and cached:
+        return cached[2], False
+    response.raise_for_status()
+    
+    body = parse_json(response)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        CONDITIONAL_CACHE[key] = (etag, last_modified, body)
+    return body, True
 
-def update_card_details(card):
-    """Update or insert card details in the trello_cards.db database."""
-    conn = sqlite3.connect(TRELLO_CARDS_DB)
-    c = conn.cursor()
+def cache_list_names(lists):
+    """Store the names of already-fetched board lists in LIST_NAME_CACHE."""
+    now = time.time()
+    LIST_NAME_CACHE.update({lst["id"]: (now, lst["name"]) for lst in lists})
+
+def refresh_lists(board_id=None):
+    """Reload LIST_NAME_CACHE with one request for all lists on the board."""
+    board_id = board_id or os.getenv("TRELLO_BOARD_ID")
+    url = f"https://api.trello.com/1/boards/{board_id}/lists"
     
+    try:
+        response = SESSION.get(url, params={"fields": "name"}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        lists = parse_json(response)
+        cache_list_names(lists)
+        logger.debug("Cached names for %d lists", len(lists))
+    except Exception as e:
+        logger.error(f"Error fetching lists for board {board_id}: {str(e)}")
+
+def get_list_name(list_id, ttl=LIST_CACHE_TTL):
+    """Resolve a list name from LIST_NAME_CACHE, refreshing the board's lists when stale or missing."""
+    if not list_id:
+        return "Unknown"
+    
+    entry = LIST_NAME_CACHE.get(list_id)
+    if entry and time.time() - entry[0] < ttl:
+        return entry[1]
+    
+    refresh_lists()
+    if list_id not in LIST_NAME_CACHE:
+        # Not on the board (e.g. archived); cache the miss so it doesn't refetch every card
+        LIST_NAME_CACHE[list_id] = (time.time(), "Unknown")
+    return LIST_NAME_CACHE[list_id][1]
+
+def update_card_details(card, conn=None, list_name=None):
+    """
+    Update or insert card details in the trello_cards.db database.
+    Pass `list_name` if it was already resolved, so no Trello request is made here.
+    """
     card_id = card.get("id")
     name = card.get("name")
     description = card.get("desc", "")
     url = card.get("url", f"https://trello.com/c/{card_id}")
     due_date = card.get("due")
     
-    # Try to get the list name - may require additional API call
-    list_id = card.get("idList")
-    list_name = "Unknown"
+    # The list is embedded in the card by get_all_cards; otherwise resolve it from the cache
+    list_name = list_name or (card.get("list") or {}).get("name") or get_list_name(card.get("idList"))
     
-    if list_id:
-        list_url = f"https://api.trello.com/1/lists/{list_id}"
-        params = {
-            "key": TRELLO_API_KEY,
-            "token": TRELLO_TOKEN
-        }
-        
-        try:
-            response = requests.get(list_url, params=params)
-            if response.ok:
-                list_data = response.json()
-                list_name = list_data.get("name", "Unknown")
-        except Exception as e:
-            print(f"Error fetching list name: {str(e)}")
-    
-    c.execute('''
-        INSERT INTO cards (card_id, name, description, url, list_name, due_date)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ON CONFLICT(card_id) DO UPDATE SET
-            name = excluded.name,
-            description = excluded.description,
-            url = excluded.url,
-            list_name = excluded.list_name,
-            due_date = excluded.due_date,
-            last_updated = CURRENT_TIMESTAMP
-    ''', (card_id, name, description, url, list_name, due_date))
-    
-    conn.commit()
-    conn.close()
+    with db_connection(conn, TRELLO_CARDS_DB) as db:
+        db.execute(UPSERT_CARD_DETAILS_SQL, (card_id, name, description, url, list_name, due_date))
 
 def get_all_cards(board_id):
-    """Fetch all cards on a given Trello board from the Trello API."""
+    """
+    Fetch all cards on a given Trello board from the Trello API.
+    Returns None if the cards are unchanged since the last fetch (304).
+    """
     url = f"https://api.trello.com/1/boards/{board_id}/cards"
     params = {
-        "key": TRELLO_API_KEY,
-        "token": TRELLO_TOKEN,
         # Request additional fields for web UI
         "fields": "id,due,name,desc,url,idList",
+        # Embed each card's list so update_card_details doesn't need a request per card
+        "list": "true",
+        "list_fields": "name",
     }
     
     print(f"Request URL: {url}")
     print(f"Request params: {params}")
     
     try:
-        response = requests.get(url, params=params)
-        print(f"Response status code: {response.status_code}")
-        
-        if response.ok:
-            return response.json()
-        else:
-            print(f"Error fetching cards: {response.text}")
-            return []
+        cards, modified = conditional_get(url, params)
+        return cards if modified else None
+    except requests.Timeout:
+        logger.warning(f"Timed out fetching cards for board {board_id}, skipping this cycle")
+        return []
     except Exception as e:
         print(f"Exception fetching cards: {str(e)}")
         return []
 
-def send_reminder(card_id, card_name, old_due, new_due):
+def refresh_card_details():
+    """Refresh the full card details (description, URL, list) in trello_cards.db."""
+    cards = get_all_cards(os.getenv("TRELLO_BOARD_ID"))
+    if cards is None:
+        logger.debug("Card details unchanged since the last refresh")
+        set_meta("last_card_sync", datetime.now().isoformat(timespec='seconds'))
+        return
+    
+    # Resolve any list names that weren't embedded before taking the write lock;
+    # get_list_name refreshes all lists with one request when it needs to
+    list_names = {
+        card.get("id"): (card.get("list") or {}).get("name") or get_list_name(card.get("idList"))
+        for card in cards
+    }
+    with db_connection(database=TRELLO_CARDS_DB) as db:
+        for card in cards:
+            update_card_details(card, db, list_names[card.get("id")])
+    if cards:
+        # Shown as "Last synced with Trello" by the web UI (app.get_last_sync)
+        set_meta("last_card_sync", datetime.now().isoformat(timespec='seconds'))
+    logger.info(f"Refreshed details for {len(cards)} cards")
+
+def send_reminder(card_id, card_name, old_due, new_due, conn=None, actions=None):
     """Send a reminder and log it to the database."""
     # Check if there's a comment after the due date change
     logger.info(f"Checking if card {card_id} ({card_name}) has comments after due date change")
-    if has_comment_after_due_date_change(card_id):
+    if has_comment_after_due_date_change(card_id, conn, actions):
         logger.info(f"Suppressing notification for card {card_name} - comment detected after due date change")
-        # Still add to database but mark as read since we're suppressing the notification
-        add_reminder(card_id, card_name, old_due, new_due)
-        
-        # Mark this reminder as read immediately since we're suppressing it
-        # First get the newest reminder ID for this card
-        conn = sqlite3.connect(CARDS_DUE_DB)
-        c = conn.cursor()
-        
-        # Find the most recent unread reminder
-        c.execute('''
-            SELECT id FROM reminders 
-            WHERE card_id = ? AND is_read = 0
-            ORDER BY created_at DESC LIMIT 1
-        ''', (card_id,))
-        
-        result = c.fetchone()
-        if result:
-            reminder_id = result[0]
-            # Now update that specific reminder
-            c.execute('UPDATE reminders SET is_read = 1 WHERE id = ?', (reminder_id,))
-            
-        conn.commit()
-        conn.close()
+        # Still add to database, already marked as read since we're suppressing the notification
+        add_reminder(card_id, card_name, old_due, new_due, conn, is_read=True)
         return
     
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -529,7 +667,7 @@ def send_reminder(card_id, card_name, old_due, new_due):
     logger.info(reminder_message)
     
     # Add reminder to the database
-    add_reminder(card_id, card_name, old_due, new_due)
+    add_reminder(card_id, card_name, old_due, new_due, conn)
     
     # Here you could add additional functionality:
     # - Send an email notification
@@ -537,51 +675,210 @@ def send_reminder(card_id, card_name, old_due, new_due):
     # - Send a message to Slack or Discord
     # - etc.
 
-def check_cards():
-    """Check all cards in the specified list for due date changes."""
+def prefetch_card_actions(card_ids):
+    """Fetch the actions of several cards through trello_batch, as {card_id: actions}."""
+    paths = [
+        f"/cards/{card_id}/actions?filter={CARD_ACTIONS_FILTER}&limit={CARD_ACTIONS_LIMIT}"
+        for card_id in card_ids
+    ]
+    
+    card_actions = {}
+    for card_id, (status, body) in zip(card_ids, trello_batch(paths)):
+        if status == 200:
+            card_actions[card_id] = body
+        else:
+            # Retry failed lookups here, not from update_stored_due_date inside the
+            # write transaction; get_card_actions returns [] if this fails too
+            card_actions[card_id] = get_card_actions(card_id)
+    return card_actions
+
+def check_cards(conn=None):
+    """
+    Check all cards in the specified list for due date changes.
+    Returns the number of changes, or None if the cards couldn't be fetched.
+    """
     # Get board ID, list ID, and cards from Trello API
     board_id, list_id, cards = get_trello_cards()
+    if cards is None:
+        return None
+    
+    # Diff against one snapshot of the table instead of a lookup per card
+    stored = load_all_stored(conn)
+    
+    # Renamed cards are updated with one executemany at the end
+    name_updates = []
+    # First pass: collect (card_id, card_name, new_due, old_due) for changed cards
+    changed = []
+    # Actions nested in the cards response, for changed cards they fully cover
+    inline_actions = {}
     
     for card in cards:
         card_id = card["id"]
         card_name = card["name"]
-        card_url = card["url"]
         current_due = card.get("due", None)  # Get current due date from Trello
         
-        # Get the stored due date from our database
-        stored_card_info = get_stored_due_date(card_id)
+        stored_card_info = stored.get(card_id, {"due_date": None, "updated_at": None, "name": None})
         stored_due = stored_card_info["due_date"]
         
         if current_due is None and stored_due is None:
             # No due date set, nothing to track
-            pass
+            continue
         elif current_due is None and stored_due is not None:
             # Due date has been removed
             print(f"Due date removed for '{card_name}': {stored_due} -> None")
-            update_stored_due_date(card_id, card_name, None, stored_due)
+            changed.append((card_id, card_name, None, stored_due))
         elif stored_due is None and current_due is not None:
             # New due date set for the first time
             print(f"Due date set for '{card_name}': None -> {current_due}")
-            update_stored_due_date(card_id, card_name, current_due, None)
+            changed.append((card_id, card_name, current_due, None))
         elif current_due != stored_due:
             # Due date changed
             print(f"Due date change detected for '{card_name}': {stored_due} -> {current_due}")
-            update_stored_due_date(card_id, card_name, current_due, stored_due)
+            changed.append((card_id, card_name, current_due, stored_due))
+        elif card_name != stored_card_info["name"]:
+            # Keep the card name in the database up to date
+            name_updates.append((card_name, card_id, card_name))
+            continue
         else:
-            # Make sure we have the card name in database (might have changed)
-            conn = sqlite3.connect(CARDS_DUE_DB)
-            c = conn.cursor()
-            c.execute('UPDATE card_due SET name = ? WHERE card_id = ?', (card_name, card_id))
-            conn.commit()
-            conn.close()
+            continue
+        
+        # The inline actions will do if they include the due date change or are
+        # all the card has; otherwise the card's actions are fetched below
+        actions = card.get("actions")
+        if actions is not None and (len(actions) < INLINE_ACTIONS_LIMIT
+                                    or get_due_date_change_time_from_trello(card_id, actions)):
+            inline_actions[card_id] = actions
+    
+    # Second pass: fetch the remaining changed cards' actions in batched requests
+    # before taking the write lock, then store all changes in one transaction
+    card_actions = prefetch_card_actions([card_id for card_id, _, _, _ in changed if card_id not in inline_actions])
+    card_actions.update(inline_actions)
+    
+    with db_connection(conn) as db:
+        for card_id, card_name, new_due, old_due in changed:
+            update_stored_due_date(card_id, card_name, new_due, old_due, conn=db, actions=card_actions.get(card_id))
+        
+        if name_updates:
+            db.executemany(UPDATE_CARD_NAME_SQL, name_updates)
     
-    print(f"Sleeping for {POLL_INTERVAL_MINUTES} minutes before next check...")
-    time.sleep(POLL_INTERVAL_MINUTES * 60)
+    return len(changed)
+
+def get_board_actions(board_id, since=None, limit=ACTIONS_PAGE_LIMIT):
+    """
+    Get updateCard actions on the board, newest first.
+    Returns only actions after `since` when given, or None on errors.
+    """
+    url = f"https://api.trello.com/1/boards/{board_id}/actions"
+    params = {
+        "filter": "updateCard",
+        "limit": limit
+    }
+    if since:
+        params["since"] = since
+    
+    try:
+        response = SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return parse_json(response)
+    except Exception as e:
+        logger.error(f"Error fetching board actions for board {board_id}: {str(e)}")
+        return None
+
+def check_due_date_actions(actions, conn=None):
+    """Apply due date (and name) changes from board actions, oldest first. Returns the number of due date changes."""
+    # card_id -> name from the card's latest rename in this batch
+    latest_names = {}
+    # (card_id, card_name, new_due, old_due, changed_at) per due date change
+    changed = []
+    # card_id -> latest due date seen in this batch
+    pending = {}
+    
+    for action in reversed(actions):
+        data = action.get("data", {})
+        old = data.get("old", {})
+        card = data.get("card", {})
+        card_id = card.get("id")
+        if not card_id:
+            continue
+        
+        if "name" in old:
+            latest_names[card_id] = card.get("name")
+        
+        if "due" not in old:
+            continue
+        
+        card_name = card.get("name")
+        old_due = old["due"]
+        new_due = card.get("due")
+        
+        # Skip changes we've already stored (e.g. picked up by a full check), comparing
+        # against earlier changes in this batch that haven't been written yet
+        if card_id in pending:
+            stored_due = pending[card_id]
+        else:
+            stored_due = get_stored_due_date(card_id, conn)["due_date"]
+        if stored_due == new_due:
+            continue
+        pending[card_id] = new_due
+        
+        print(f"Due date change detected for '{card_name}': {old_due} -> {new_due}")
+        changed.append((card_id, card_name, new_due, old_due, action["date"]))
+    
+    # Only reminders need the card's comments; fetch them before taking the write lock
+    card_actions = prefetch_card_actions(list({
+        card_id for card_id, _, new_due, old_due, _ in changed if old_due is not None and old_due != new_due
+    }))
+    
+    with db_connection(conn) as db:
+        for card_id, card_name, new_due, old_due, changed_at in changed:
+            update_stored_due_date(card_id, card_name, new_due, old_due, changed_at=changed_at, conn=db,
+                                   actions=card_actions.get(card_id))
+        # Renames go last: the due date upserts above store the name each action
+        # carried, which may predate a later rename in the batch
+        if latest_names:
+            db.executemany(UPDATE_CARD_NAME_SQL, [(name, card_id, name) for card_id, name in latest_names.items()])
+    
+    return len(changed)
+
+def poll_once():
+    """
+    Run one polling cycle.
+    Only board actions since the last processed one are fetched; a full card
+    check runs on a cold start or when the actions can't be used.
+    Trello requests are made up front, so each check's writes go through one short
+    transaction. Returns True if any due date changed.
+    """
+    board_id = os.getenv("TRELLO_BOARD_ID")
+    last_action_date = get_meta("last_action_date")
+    COMMENTS_FETCHED.clear()
+    
+    if last_action_date:
+        actions = get_board_actions(board_id, since=last_action_date)
+        if actions is not None and len(actions) < ACTIONS_PAGE_LIMIT:
+            changes = check_due_date_actions(actions)
+            # Replaying actions after a crash is harmless: stored changes are skipped
+            if actions:
+                set_meta("last_action_date", actions[0]["date"])
+            return changes > 0
+        logger.info("Board actions unavailable or truncated, falling back to a full card check")
+    
+    # Remember where the action log stands before scanning so nothing is missed
+    latest = get_board_actions(board_id, limit=1)
+    changes = check_cards()
+    if changes is None:
+        # Keep the watermark so the full check is retried next cycle
+        return False
+    if latest:
+        set_meta("last_action_date", latest[0]["date"])
+    elif latest is not None:
+        set_meta("last_action_date", datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'))
+    return changes > 0
 
 def main():
     """Main function to poll the Trello board and check for due date changes."""
-    # Initialize the database
+    # Initialize the databases
     init_db()
+    init_cards_db()
     
     # Check environment variables
     required_vars = ["TRELLO_API_KEY", "TRELLO_TOKEN", "TRELLO_BOARD_ID"]
@@ -593,69 +890,91 @@ def main():
         return
     
     logger.info("Starting Trello Due Date Monitor")
-    logger.info(f"Checking for due date changes every {POLL_INTERVAL_MINUTES} minutes")
+    logger.info(f"Checking for due date changes every {POLL_INTERVAL_MINUTES} minutes, backing off to {MAX_POLL_INTERVAL / 60:g} minutes while the board is quiet")
     
     # Continuous monitoring loop
+    last_full_sync = None
+    # Consecutive cycles without a due date change; each one doubles the wait, up to MAX_POLL_INTERVAL
+    idle_cycles = 0
+    # Cycles are scheduled from when the previous one started, so the time spent
+    # polling doesn't push every later check back
+    next_tick = time.monotonic()
     while True:
         try:
-            check_cards()
+            # Card details change rarely, so refresh them on a slower cadence than due dates
+            if last_full_sync is None or time.monotonic() - last_full_sync >= FULL_SYNC_INTERVAL:
+                refresh_card_details()
+                last_full_sync = time.monotonic()
+            
+            if poll_once():
+                idle_cycles = 0
+            else:
+                idle_cycles += 1
+            
+            interval = min(MAX_POLL_INTERVAL, POLL_INTERVAL * (2 ** min(idle_cycles, 4)))
+            print(f"Sleeping for {interval / 60:g} minutes before next check...")
         except Exception as e:
             logger.error(f"Error in monitoring loop: {str(e)}")
             logger.error(f"Will retry in {POLL_INTERVAL_MINUTES} minutes")
-            time.sleep(POLL_INTERVAL_MINUTES * 60)
+            interval = POLL_INTERVAL
+        
+        next_tick += interval
+        now = time.monotonic()
+        if next_tick < now:
+            # The cycle overran its slot; start the next one now rather than bursting to catch up
+            next_tick = now
+        time.sleep(next_tick - now)
 
 def get_trello_cards():
-    """Get board, list, and cards from Trello API."""
-    # Trello API credentials
-    api_key = os.getenv("TRELLO_API_KEY")
-    api_token = os.getenv("TRELLO_TOKEN")
-    
-    # Log the credentials being used (without revealing full values)
-    logger.debug(f"Using API key starting with: {api_key[:4]}... and token: {api_token[:4]}..." if api_key and api_token else "Missing API credentials")
-    
-    if not api_key or not api_token:
+    """
+    Get board, list, and cards from Trello API.
+    Returns (None, None, None) if the cards couldn't be fetched.
+    """
+    if not TRELLO_API_KEY or not TRELLO_TOKEN:
         logger.error("Missing Trello API credentials. Check your .env file.")
-        return None, None, []
+        return None, None, None
     
     # Get board ID from environment
     board_id = os.getenv("TRELLO_BOARD_ID")
     if not board_id:
         logger.error("Missing TRELLO_BOARD_ID in .env file.")
-        return None, None, []
+        return None, None, None
     
-    # Get all lists on the board
     lists_url = f"https://api.trello.com/1/boards/{board_id}/lists"
-    lists_params = {
-        "key": api_key,
-        "token": api_token
+    cards_url = f"https://api.trello.com/1/boards/{board_id}/cards"
+    # Only what the due date check needs; descriptions etc. come from refresh_card_details.
+    # Recent actions come nested in each card so check_cards rarely needs /actions calls
+    cards_params = {
+        "fields": "id,name,due",
+        "actions": CARD_ACTIONS_FILTER,
+        "actions_limit": INLINE_ACTIONS_LIMIT,
+        "action_fields": "date,type,data",
     }
     
     try:
-        logger.debug(f"Fetching lists from board {board_id}")
-        lists_response = requests.get(lists_url, params=lists_params)
-        lists_response.raise_for_status()
-        lists = lists_response.json()
-        
-        # Get all cards on the board
-        cards_url = f"https://api.trello.com/1/boards/{board_id}/cards"
-        cards_params = {
-            "key": api_key,
-            "token": api_token
-        }
+        # Fetch the lists and cards on the board concurrently; on a quiet board both
+        # come back 304 and the previous responses are reused
+        logger.debug("Fetching lists and cards from board %s", board_id)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            lists_future = executor.submit(conditional_get, lists_url)
+            cards_future = executor.submit(conditional_get, cards_url, cards_params)
+            lists, _ = lists_future.result()
+            cards, _ = cards_future.result()
         
-        logger.debug(f"Fetching cards from board {board_id}")
-        cards_response = requests.get(cards_url, params=cards_params)
-        cards_response.raise_for_status()
-        cards = cards_response.json()
+        # We have every list anyway, so warm the list name cache for update_card_details
+        cache_list_names(lists)
         
         # Return board ID, first list ID, and all cards
         list_id = lists[0]["id"] if lists else None
         
-        logger.debug(f"Found {len(cards)} cards on board {board_id}")
+        logger.debug("Found %d cards on board %s", len(cards), board_id)
         return board_id, list_id, cards
+    except requests.Timeout:
+        logger.warning(f"Timed out fetching Trello data for board {board_id}, skipping this cycle")
+        return None, None, None
     except Exception as e:
         logger.error(f"Error fetching Trello data: {str(e)}")
-        return None, None, []
+        return None, None, None
 
 if __name__ == "__main__":
     main()